@@ -2,9 +2,12 @@
 """Demo script to test the Jira scraper with a small dataset."""
 
 import asyncio
-import json
+import logging
+import traceback
 from pathlib import Path
 
+from jira_scraper import json_utils
+from jira_scraper.cli import install_uvloop
 from jira_scraper.scraper import JiraScraper
 from jira_scraper.transformer import DataTransformer
 
@@ -12,70 +15,64 @@ from jira_scraper.transformer import DataTransformer
 async def demo():
     """Run a small demo of the scraper."""
     print("🚀 Starting Jira Scraper Demo")
-    
+
     # Create output directory
     output_dir = Path("demo_output")
     output_dir.mkdir(exist_ok=True)
-    
+
     # Initialize scraper with conservative settings
     scraper = JiraScraper(
         projects=["STDCXX"],  # Just one project for demo
         output_dir=output_dir,
-        max_concurrent=2,    # Be respectful
+        max_concurrent=2,  # Be respectful
         rate_limit_delay=2.0,  # 2 second delay between requests
+        max_issues_per_project=5,  # Limit for demo
     )
-    
+
     transformer = DataTransformer(output_dir)
-    
+
     try:
         print("📡 Fetching first few issues from STDCXX project...")
-        
-        # Get just a few issues for demo
-        issues = []
-        issue_count = 0
-        max_issues = 5  # Limit for demo
-        
-        async for issue_key in scraper.get_project_issues("STDCXX"):
-            if issue_count >= max_issues:
-                break
-                
-            print(f"  Fetching {issue_key}...")
-            issue = await scraper.get_issue_details(issue_key)
-            if issue:
-                issues.append(issue)
-                issue_count += 1
-        
+
+        # Get just a few issues for demo, full details come with the search
+        issues = await scraper.scrape_project("STDCXX")
+
         print(f"✅ Successfully scraped {len(issues)} issues")
-        
+
         # Transform and save data
         print("🔄 Transforming data...")
-        await transformer.transform_issues(issues)
+        stats = await transformer.process_all(issues, on_written=scraper.checkpoint)
         await transformer.save_raw_data(issues)
-        
-        # Generate statistics
-        stats = transformer.generate_stats(issues)
+
+        # Save statistics
         stats_file = output_dir / "stats.json"
-        with open(stats_file, "w") as f:
-            json.dump(stats, f, indent=2)
-        
-        print("📊 Statistics:")
-        print(f"  Total issues: {stats['total_issues']}")
-        print(f"  Total comments: {stats['total_comments']}")
-        print(f"  Avg comments per issue: {stats['avg_comments_per_issue']:.1f}")
-        
+        stats_file.write_bytes(json_utils.dumps(stats, indent=True))
+
+        if stats:
+            print("📊 Statistics:")
+            print(f"  Total issues: {stats['total_issues']}")
+            print(f"  Total comments: {stats['total_comments']}")
+            print(f"  Avg comments per issue: {stats['avg_comments_per_issue']:.1f}")
+        else:
+            print("📊 No new issues to report")
+
         print(f"\n📁 Output saved to: {output_dir}")
         print("  - training_data.jsonl: LLM training data")
-        print("  - raw_issues.json: Raw Jira data")
+        print("  - raw_issues.json: Parsed issue data")
+        print("  - raw_issues.jsonl: Raw Jira API responses")
         print("  - stats.json: Statistics")
-        
+        print("  - scraper_state.txt: Processed issue keys")
+
     except KeyboardInterrupt:
         print("\n⏹️  Demo interrupted")
     except Exception as e:
-        e.with_traceback()
+        traceback.print_exc()
         print(f"❌ Error: {str(e)}")
     finally:
         await scraper.close()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    install_uvloop()
     asyncio.run(demo())
@@ -1,20 +1,54 @@
 """Command line interface for Jira scraper."""
 
 import asyncio
-import json
+import importlib.util
+import logging
+import sys
+from logging.handlers import MemoryHandler
 from pathlib import Path
+from typing import AsyncIterator
 
 import click
 from click.testing import CliRunner
 from rich.console import Console
 from rich.progress import Progress, SpinnerColumn, TextColumn
 
+from . import json_utils
+from .models import JiraIssue
 from .scraper import JiraScraper
 from .transformer import DataTransformer
 
 console = Console()
 
 
+def install_uvloop() -> None:
+    """Use uvloop's faster event loop when it is installed (POSIX only)."""
+    if sys.platform == "win32":
+        return
+
+    try:
+        import uvloop  # type: ignore
+    except ImportError:
+        return
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+
+def configure_logging() -> logging.Handler:
+    """Print library log records to stderr, batched to keep writes off hot paths."""
+    package_logger = logging.getLogger("jira_scraper")
+    for handler in package_logger.handlers:
+        if isinstance(handler, MemoryHandler):
+            return handler
+
+    handler = MemoryHandler(
+        capacity=1000, flushLevel=logging.ERROR, target=logging.StreamHandler()
+    )
+    package_logger.addHandler(handler)
+    package_logger.setLevel(logging.INFO)
+    return handler
+
+
 @click.command()
 @click.option(
     "--projects",
@@ -43,7 +77,7 @@ console = Console()
     "-r",
     type=float,
     default=1.0,
-    help="Rate limit delay in seconds",
+    help="Delay between requests per concurrent slot in seconds",
 )
 @click.option(
     "--resume",
@@ -56,6 +90,16 @@ console = Console()
     type=int,
     help="Limit number of issues per project (for testing)",
 )
+@click.option(
+    "--compact-records",
+    is_flag=True,
+    help="Store the issue text once per record instead of in every task",
+)
+@click.option(
+    "--compress-raw",
+    is_flag=True,
+    help="Write raw API responses zstd-compressed (needs the zstd extra)",
+)
 def main(
     projects: tuple,
     output_dir: Path,
@@ -63,6 +107,8 @@ def main(
     rate_limit: float,
     resume: bool,
     limit: int,
+    compact_records: bool,
+    compress_raw: bool,
 ) -> None:
     """Scrape Apache Jira issues for LLM training data.
     \n
@@ -74,13 +120,38 @@ def main(
     console.print(f"Max concurrent requests: {max_concurrent}")
     console.print(f"Rate limit: {rate_limit}s")
 
-    if not resume:
-        # Clear previous state
-        state_file = output_dir / "scraper_state.json"
-        if state_file.exists():
-            state_file.unlink()
+    if compress_raw and importlib.util.find_spec("zstandard") is None:
+        raise click.UsageError("--compress-raw requires the zstandard package")
 
-    asyncio.run(scrape_data(projects, output_dir, max_concurrent, rate_limit, limit))
+    if not resume:
+        # Clear previous state and the raw responses it refers to
+        for name in (
+            "scraper_state.txt",
+            "scraper_state.json",
+            "raw_issues.jsonl",
+            "raw_issues.jsonl.zst",
+        ):
+            previous = output_dir / name
+            if previous.exists():
+                previous.unlink()
+
+    install_uvloop()
+    log_handler = configure_logging()
+    try:
+        asyncio.run(
+            scrape_data(
+                projects,
+                output_dir,
+                max_concurrent,
+                rate_limit,
+                limit,
+                compress_raw,
+                compact_records,
+                resume,
+            )
+        )
+    finally:
+        log_handler.flush()
 
 
 async def scrape_data(
@@ -89,6 +160,9 @@ async def scrape_data(
     max_concurrent: int,
     rate_limit: float,
     limit: int,
+    compress_raw: bool = False,
+    compact_records: bool = False,
+    resume: bool = False,
 ) -> None:
     """Main scraping logic."""
     scraper = JiraScraper(
@@ -97,9 +171,10 @@ async def scrape_data(
         max_concurrent=max_concurrent,
         rate_limit_delay=rate_limit,
         max_issues_per_project=limit,
+        compress_raw=compress_raw,
     )
 
-    transformer = DataTransformer(output_dir)
+    transformer = DataTransformer(output_dir, compact=compact_records, append=resume)
 
     try:
         with Progress(
@@ -109,30 +184,45 @@ async def scrape_data(
         ) as progress:
             task = progress.add_task("Scraping Jira issues...", total=None)
 
-            # Scrape all projects
-            issues = await scraper.scrape_all_projects()
-
-            progress.update(task, description="Transforming data...")
-
-            # Transform and save data
-            await transformer.transform_issues(issues)
-            await transformer.save_raw_data(issues)
+            # The scraper runs projects as background producers behind a
+            # bounded queue, so records are written while scraping continues
+            # and memory stays flat
+            scraped = 0
+
+            async def tracked() -> AsyncIterator[JiraIssue]:
+                nonlocal scraped
+                async for issue in scraper.iter_all_issues():
+                    scraped += 1
+                    progress.update(
+                        task, description=f"Scraped {scraped} Jira issues..."
+                    )
+                    yield issue
+
+            # Training data and statistics are produced in one pass, raw API
+            # responses are already streamed by the scraper. Issues are
+            # checkpointed only once their records are on disk
+            stats = await transformer.process_all(
+                tracked(), on_written=scraper.checkpoint
+            )
 
-            # Generate and save statistics
-            stats = transformer.generate_stats(issues)
+            # Save statistics
             stats_file = output_dir / "stats.json"
-            with open(stats_file, "w") as f:
-                json.dump(stats, f, indent=2)
+            stats_file.write_bytes(json_utils.dumps(stats, indent=True))
 
             progress.update(task, description="Complete!")
 
         # Display results
         console.print(f"\n[bold green]Scraping completed![/bold green]")
-        console.print(f"Total issues scraped: {len(issues)}")
+        console.print(f"Total issues scraped: {scraped}")
         console.print(f"Output saved to: {output_dir}")
+        if scraper.failed_projects:
+            console.print(
+                f"[yellow]Incomplete projects: {', '.join(scraper.failed_projects)}"
+                " (rerun with --resume)[/yellow]"
+            )
 
         # Display statistics
-        if issues:
+        if stats:
             console.print("\n[bold]Statistics:[/bold]")
             for project, count in stats["projects"].items():
                 console.print(f"  {project}: {count} issues")
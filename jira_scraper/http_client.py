@@ -1,13 +1,78 @@
 import asyncio
-from typing import Any, AsyncGenerator, Dict, Optional
+import logging
+import time
+from typing import Any, AsyncGenerator, Dict, List, Optional, Set
 
 import httpx
-from tenacity import (
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
+
+from . import __version__, json_utils
+
+logger = logging.getLogger(__name__)
+
+# Retry policy: exponential backoff between attempts, clamped to these bounds
+_MAX_ATTEMPTS = 3
+_RETRY_WAIT_MIN = 4.0
+_RETRY_WAIT_MAX = 10.0
+_RATE_LIMIT_WAIT = 10.0
+
+# Fixed query parameters, built once and extended per request
+_SEARCH_ENDPOINT = "/rest/api/2/search"
+_ISSUE_PARAMS: Dict[str, Any] = {"expand": "comments", "fields": "*all"}
+_BATCH_PARAMS: Dict[str, Any] = {
+    "fields": "*all",
+    "expand": "comments",
+    # Don't fail the whole batch on a key that was moved or deleted
+    "validateQuery": "false",
+}
+
+
+def _retry_after(response: httpx.Response) -> float:
+    """Seconds to wait after a 429, from the Retry-After header if present."""
+    try:
+        return float(response.headers.get("Retry-After", _RATE_LIMIT_WAIT))
+    except ValueError:
+        return _RATE_LIMIT_WAIT
+
+
+class TokenBucket:
+    """Token bucket limiting the average request rate across concurrent callers."""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available and consume it."""
+        if self.rate <= 0:
+            return
+
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def pause(self, delay: float) -> None:
+        """Drain the bucket so no token is handed out for `delay` seconds."""
+        if self.rate <= 0:
+            return
+
+        self._refill()
+        self._tokens = min(self._tokens, -delay * self.rate)
 
 
 class JiraHttpClient:
@@ -18,20 +83,38 @@ class JiraHttpClient:
         base_url: str = "https://issues.apache.org/jira",
         rate_limit_delay: float = 1.0,
         timeout: float = 30.0,
+        max_concurrent: int = 5,
     ):
         self.base_url = base_url
         self.rate_limit_delay = rate_limit_delay
+        self.max_concurrent = max_concurrent
+
+        # Up to max_concurrent requests in flight, each slot averaging one
+        # request per delay, the same rate as sleeping before every request
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tokens = TokenBucket(
+            rate=max_concurrent / rate_limit_delay if rate_limit_delay > 0 else 0,
+            capacity=max_concurrent,
+        )
 
+        # HTTP/2 multiplexes concurrent requests over a few kept-alive connections
+        # Accept-Encoding is left to httpx, which advertises only the codecs it
+        # can decode (br with the brotli package, zstd with zstandard)
         self.client = httpx.AsyncClient(
-            timeout=timeout,
-            limits=httpx.Limits(max_connections=10),
+            http2=True,
+            headers={
+                "Accept": "application/json",
+                "User-Agent": f"jira-scraper/{__version__}",
+            },
+            # Fail fast on unreachable hosts, give slow responses the full timeout
+            timeout=httpx.Timeout(timeout, connect=min(timeout, 10.0)),
+            limits=httpx.Limits(
+                max_connections=max(max_concurrent * 2, 32),
+                max_keepalive_connections=max_concurrent,
+                keepalive_expiry=30.0,
+            ),
         )
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((httpx.HTTPError, httpx.TimeoutException)),
-    )
     async def request(
         self,
         method: str,
@@ -40,17 +123,35 @@ class JiraHttpClient:
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """Make HTTP request with retry logic and rate limiting."""
-        await asyncio.sleep(self.rate_limit_delay)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
 
         url = f"{self.base_url}{endpoint}"
-        response = await self.client.request(method, url, params=params, **kwargs)
+        attempt = 0
+
+        while True:
+            try:
+                async with self._semaphore:
+                    await self._tokens.acquire()
+                    response = await self.client.request(
+                        method, url, params=params, **kwargs
+                    )
+
+                if response.status_code == 429:
+                    # Hold back every caller, not just this one, before retrying
+                    self._tokens.pause(_retry_after(response))
+                    raise httpx.HTTPError("Rate limited")
 
-        if response.status_code == 429:
-            await asyncio.sleep(10)
-            raise httpx.HTTPError("Rate limited")
+                response.raise_for_status()
+                return json_utils.loads(response.content)  # type: ignore
 
-        response.raise_for_status()
-        return response.json()  # type: ignore
+            except httpx.HTTPError:
+                attempt += 1
+                if attempt >= _MAX_ATTEMPTS:
+                    raise
+                await asyncio.sleep(
+                    min(_RETRY_WAIT_MAX, _RETRY_WAIT_MIN * 2 ** (attempt - 1))
+                )
 
     async def get(
         self, endpoint: str, params: Optional[Dict[str, Any]] = None
@@ -58,44 +159,134 @@ class JiraHttpClient:
         """GET request."""
         return await self.request("GET", endpoint, params=params)
 
-    async def search_issues(
+    async def search_issue_pages(
         self,
         project: str,
         fields: str = "key",
         max_results: int = 50,
-    ) -> AsyncGenerator[Dict[str, Any], None]:
-        """Paginated JQL search using API v2."""
-        start_at = 0
+        expand: Optional[str] = None,
+        max_issues: Optional[int] = None,
+    ) -> AsyncGenerator[List[Dict[str, Any]], None]:
+        """Paginated JQL search using API v2, yielding one page of issues at a time.
 
-        while True:
-            params = {
-                "jql": f"project = {project} ORDER BY created DESC",
-                "startAt": start_at,
-                "maxResults": max_results,
-                "fields": fields,
-            }
+        Once a page reports the total, the remaining pages are requested
+        concurrently and yielded as they arrive, so page order is not kept.
+        A page that fails is requested once more after the others, and the
+        error is raised if it fails again.
+        """
+        base_params: Dict[str, Any] = {
+            "jql": f"project = {project} ORDER BY created DESC",
+            "maxResults": max_results,
+            "fields": fields,
+        }
+        if expand:
+            base_params["expand"] = expand
+        start_at = 0
+        total = None
 
-            data = await self.get("/rest/api/2/search", params)
+        # Walk sequentially until the server tells us how many issues there are
+        while not isinstance(total, int):
+            params = {**base_params, "startAt": start_at}
+            data = await self.get(_SEARCH_ENDPOINT, params)
             issues = data.get("issues", [])
 
-            for issue in issues:
-                yield issue
-
-            if len(issues) < max_results:
-                break
+            if issues:
+                yield issues
 
             start_at += max_results
+            if len(issues) < max_results or (max_issues and start_at >= max_issues):
+                return
+
+            total = data.get("total")
+
+        if max_issues:
+            total = min(total, max_issues)
+
+        offsets = iter(range(start_at, total, max_results))
+        pending: Set["asyncio.Future[Dict[str, Any]]"] = set()
+        page_starts: Dict["asyncio.Future[Dict[str, Any]]", int] = {}
+        failed: List[int] = []
+        try:
+            while True:
+                # Keep a bounded number of page requests queued on the semaphore
+                for offset in offsets:
+                    params = {**base_params, "startAt": offset}
+                    future = asyncio.ensure_future(self.get(_SEARCH_ENDPOINT, params))
+                    page_starts[future] = offset
+                    pending.add(future)
+                    if len(pending) >= self.max_concurrent:
+                        break
+
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    offset = page_starts.pop(task)
+                    try:
+                        data = task.result()
+                    except httpx.HTTPError as e:
+                        # One bad page shouldn't hold up the rest of the project
+                        logger.warning(
+                            "Deferring %s search page at %d: %s", project, offset, e
+                        )
+                        failed.append(offset)
+                        continue
+
+                    issues = data.get("issues", [])
+                    if issues:
+                        yield issues
+        finally:
+            for task in pending:
+                task.cancel()
+
+        for offset in failed:
+            params = {**base_params, "startAt": offset}
+            data = await self.get(_SEARCH_ENDPOINT, params)
+            issues = data.get("issues", [])
+            if issues:
+                yield issues
+
+    async def search_issues(
+        self,
+        project: str,
+        fields: str = "key",
+        max_results: int = 50,
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Paginated JQL search using API v2."""
+        async for page in self.search_issue_pages(project, fields, max_results):
+            for issue in page:
+                yield issue
 
     async def get_issue(
         self, issue_key: str, expand: str = "comments"
     ) -> Dict[str, Any]:
         """Get single issue details using API v2."""
-        params = {
-            "expand": expand,
-            "fields": "*all",
-        }
+        params = _ISSUE_PARAMS
+        if expand != params["expand"]:
+            params = {**params, "expand": expand}
         return await self.get(f"/rest/api/2/issue/{issue_key}", params)
 
+    async def get_issues_batch(
+        self, keys: List[str], batch_size: int = 50
+    ) -> List[Dict[str, Any]]:
+        """Get full issue details with one JQL search per batch of keys."""
+        issues: List[Dict[str, Any]] = []
+
+        for start in range(0, len(keys), batch_size):
+            batch = keys[start : start + batch_size]
+            params = {
+                **_BATCH_PARAMS,
+                "jql": f"key in ({','.join(batch)})",
+                "maxResults": len(batch),
+            }
+            data = await self.get(_SEARCH_ENDPOINT, params)
+            issues.extend(data.get("issues", []))
+
+        return issues
+
     async def close(self) -> None:
         """Close HTTP client."""
         await self.client.aclose()
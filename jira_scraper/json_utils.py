@@ -0,0 +1,34 @@
+"""JSON helpers using orjson when available, stdlib json otherwise."""
+
+import json
+from datetime import datetime
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+
+def _default(obj: Any) -> Any:
+    """Serialize objects the stdlib encoder does not handle."""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    return str(obj)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 encoded JSON bytes, optionally indented by 2 spaces."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(
+        obj, indent=2 if indent else None, default=_default, ensure_ascii=False
+    ).encode("utf-8")
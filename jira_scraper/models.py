@@ -1,10 +1,43 @@
 """Data models for Jira scraping with validation."""
 
+import sys
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field, field_validator, model_validator
 
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:  # pragma: no cover - optional dependency
+    if sys.version_info >= (3, 11):
+        # fromisoformat accepts "Z" and "+0000" offsets natively since 3.11
+        _parse_iso = datetime.fromisoformat  # type: ignore
+    else:
+        _parse_iso = None  # type: ignore
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Jira ISO-8601 timestamp, returning None if missing or invalid."""
+    if not value:
+        return None
+
+    try:
+        if _parse_iso is not None:
+            return _parse_iso(value)
+        # Older fromisoformat only takes "+HH:MM" offsets, Jira sends "+HHMM"
+        if value.endswith("Z"):
+            value = value[:-1] + "+00:00"
+        elif value[-5:-4] in ("+", "-"):
+            value = value[:-2] + ":" + value[-2:]
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _intern(value: Any) -> Any:
+    """Share one copy of strings repeated across issues, like names and statuses."""
+    return sys.intern(value) if type(value) is str else value
+
 
 class JiraComment(BaseModel):
     """Jira comment model."""
@@ -16,36 +49,42 @@ class JiraComment(BaseModel):
     updated: Optional[datetime] = None
 
     @classmethod
-    def from_api_response(cls, data: Dict[str, Any]) -> "JiraComment":
-        """Create from Jira API response with None handling."""
+    def from_api_response(
+        cls, data: Dict[str, Any], validate: bool = False
+    ) -> "JiraComment":
+        """Create from Jira API response with None handling.
+
+        Fields are sanitized here, so validation is skipped unless `validate`.
+        """
         if not data:
             data = {}
 
         author = data.get("author") or {}
 
-        created = None
-        updated = None
-
-        if data.get("created"):
-            try:
-                created = datetime.fromisoformat(data["created"].replace("Z", "+00:00"))
-            except Exception:
-                pass
-
-        if data.get("updated"):
-            try:
-                updated = datetime.fromisoformat(data["updated"].replace("Z", "+00:00"))
-            except Exception:
-                pass
+        created = _parse_datetime(data.get("created"))
+        updated = _parse_datetime(data.get("updated"))
 
-        return cls(
+        values: Dict[str, Any] = dict(
             id=data.get("id") or "",
-            author=author.get("displayName") or "",
+            author=_intern(author.get("displayName") or ""),
             body=data.get("body") or "",
             created=created or datetime.now(),
             updated=updated,
         )
 
+        if validate:
+            return cls.model_validate(values)
+        return cls.model_construct(**values)
+
+    @classmethod
+    def from_api_response_validated(cls, data: Dict[str, Any]) -> "JiraComment":
+        """Create from Jira API response, always running full validation."""
+        return cls.from_api_response(data, validate=True)
+
+
+# Fields that JiraIssue validators reject when empty
+_ISSUE_REQUIRED_FIELDS = ("key", "project", "status", "reporter")
+
 
 class JiraIssue(BaseModel):
     """Jira issue model with validation."""
@@ -96,52 +135,38 @@ class JiraIssue(BaseModel):
         return v
 
     @classmethod
-    def from_api_response(cls, data: Dict[str, Any]) -> "JiraIssue":
-        """Create and validate from Jira API response with None handling."""
+    def from_api_response(
+        cls, data: Dict[str, Any], validate: bool = False, keep_raw: bool = False
+    ) -> "JiraIssue":
+        """Create and validate from Jira API response with None handling.
+
+        Fields are sanitized here, so full validation only runs when
+        `validate` is set or a required field is empty, raising ValidationError.
+        The response itself is only kept in `raw_data` when `keep_raw` is set.
+        """
         if not data:
             data = {}
 
         fields = data.get("fields") or {}
 
         # Parse comments with None handling
-        comments = []
+        comments: List[JiraComment] = []
         comment_data = fields.get("comment")
         if comment_data and isinstance(comment_data, dict):
-            for comment in comment_data.get("comments", []):
+            # Local aliases keep attribute lookups out of the per-comment loop
+            parse_comment = JiraComment.from_api_response
+            append = comments.append
+            for comment in comment_data.get("comments") or ():
                 if comment:
                     try:
-                        comments.append(JiraComment.from_api_response(comment))
+                        append(parse_comment(comment, validate))
                     except Exception:
                         continue
 
         # Parse dates with None handling
-        created = None
-        updated = None
-        resolved = None
-
-        if fields.get("created"):
-            try:
-                created = datetime.fromisoformat(
-                    fields["created"].replace("Z", "+00:00")
-                )
-            except Exception:
-                pass
-
-        if fields.get("updated"):
-            try:
-                updated = datetime.fromisoformat(
-                    fields["updated"].replace("Z", "+00:00")
-                )
-            except Exception:
-                pass
-
-        if fields.get("resolutiondate"):
-            try:
-                resolved = datetime.fromisoformat(
-                    fields["resolutiondate"].replace("Z", "+00:00")
-                )
-            except Exception:
-                pass
+        created = _parse_datetime(fields.get("created"))
+        updated = _parse_datetime(fields.get("updated"))
+        resolved = _parse_datetime(fields.get("resolutiondate"))
 
         # Extract fields with safe None handling
         project = fields.get("project") or {}
@@ -150,32 +175,57 @@ class JiraIssue(BaseModel):
         priority = fields.get("priority") or {}
         assignee = fields.get("assignee") or {}
 
-        return cls(
+        values: Dict[str, Any] = dict(
             key=data.get("key") or "",
             id=data.get("id") or "",
-            project=project.get("key") or "",
+            project=_intern(project.get("key") or ""),
             summary=fields.get("summary") or "",
             description=fields.get("description"),
-            status=status.get("name") or "",
-            priority=priority.get("name"),
-            assignee=assignee.get("displayName"),
-            reporter=reporter.get("displayName") or "",
+            status=_intern(status.get("name") or ""),
+            priority=_intern(priority.get("name")),
+            assignee=_intern(assignee.get("displayName")),
+            reporter=_intern(reporter.get("displayName") or ""),
             created=created or datetime.now(),
             updated=updated or datetime.now(),
             resolved=resolved,
-            labels=fields.get("labels") or [],
+            labels=[_intern(label) for label in fields.get("labels") or []],
             components=[
-                c.get("name", "")
+                _intern(c.get("name", ""))
                 for c in (fields.get("components") or [])
                 if c and isinstance(c, dict)
             ],
             comments=comments,
-            raw_data=data,
+            raw_data=data if keep_raw else {},
         )
 
+        if validate or not all(values[name] for name in _ISSUE_REQUIRED_FIELDS):
+            return cls.model_validate(values)
+        return cls.model_construct(**values)
+
+    @classmethod
+    def from_api_response_validated(
+        cls, data: Dict[str, Any], keep_raw: bool = False
+    ) -> "JiraIssue":
+        """Create from Jira API response, validating the issue and its comments."""
+        return cls.from_api_response(data, validate=True, keep_raw=keep_raw)
+
+
+# Task fields that take the record's text_content as their input
+_TASK_TEXT_FIELDS = {
+    "summarization": "input",
+    "classification": "input",
+    "qa": "context",
+}
+
+# QA question that does not depend on the issue
+_PRIORITY_QUESTION = "What is the priority of this issue?"
+
 
 class LLMTrainingRecord(BaseModel):
-    """Training record for LLM."""
+    """Training record for LLM.
+
+    Tasks don't repeat the issue text, their input is always `text_content`.
+    """
 
     issue_key: str
     project: str
@@ -186,14 +236,9 @@ class LLMTrainingRecord(BaseModel):
     @classmethod
     def from_jira_issue(cls, issue: JiraIssue) -> "LLMTrainingRecord":
         """Convert Jira issue to training record."""
-        # Combine description and comments
-        text_parts = []
-        if issue.description:
-            text_parts.append(f"Description: {issue.description}")
-
-        for comment in issue.comments:
-            text_parts.append(f"Comment by {comment.author}: {comment.body}")
-
+        # Combine description and comments with a single join
+        text_parts = ["Description: " + issue.description] if issue.description else []
+        text_parts.extend([f"Comment by {c.author}: {c.body}" for c in issue.comments])
         text_content = "\n\n".join(text_parts)
 
         # Create metadata
@@ -211,14 +256,12 @@ class LLMTrainingRecord(BaseModel):
             "comment_count": len(issue.comments),
         }
 
-        # Create training tasks
+        # Create training tasks, their input is the record's text_content
         tasks = {
             "summarization": {
-                "input": text_content,
                 "target": issue.summary,
             },
             "classification": {
-                "input": text_content,
                 "target": {
                     "status": issue.status,
                     "priority": issue.priority,
@@ -226,19 +269,26 @@ class LLMTrainingRecord(BaseModel):
                 },
             },
             "qa": {
-                "context": text_content,
                 "questions": [
                     f"What is the status of issue {issue.key}?",
                     f"Who reported issue {issue.key}?",
-                    f"What is the priority of this issue?",
+                    _PRIORITY_QUESTION,
                 ],
             },
         }
 
-        return cls(
+        # Fields are built from an already validated JiraIssue, skip revalidation
+        return cls.model_construct(
             issue_key=issue.key,
             project=issue.project,
             metadata=metadata,
             text_content=text_content,
             tasks=tasks,
         )
+
+    def model_dump_expanded(self) -> Dict[str, Any]:
+        """Dump the record with text_content copied into every task's input."""
+        data = self.model_dump()
+        for task, field in _TASK_TEXT_FIELDS.items():
+            data["tasks"][task] = {field: self.text_content, **data["tasks"][task]}
+        return data
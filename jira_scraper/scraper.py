@@ -1,13 +1,27 @@
 """Simplified Jira scraper using unified models."""
 
 import asyncio
-import json
+import logging
+import os
 from pathlib import Path
-from typing import AsyncGenerator, List, Optional, Set
+from typing import IO, Any, AsyncGenerator, Dict, Iterable, List, Optional, Set
 
+from pydantic import ValidationError
+
+from . import json_utils
 from .http_client import JiraHttpClient
 from .models import JiraIssue
 
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Scraped issues waiting for the consumer, shared by all project producers
+_QUEUE_SIZE = 256
+
 
 class JiraScraper:
 
@@ -18,110 +32,273 @@ class JiraScraper:
         max_concurrent: int = 5,
         rate_limit_delay: float = 1.0,
         max_issues_per_project: Optional[int] = None,
+        batch_size: int = 50,
+        compress_raw: bool = False,
     ):
         self.projects = projects
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.max_concurrent = max_concurrent
         self.max_issues_per_project = max_issues_per_project
+        self.batch_size = batch_size
 
-        # State management
-        self.state_file = self.output_dir / "scraper_state.json"
+        # State management, an append-only checkpoint with one issue key per line
+        self.state_file = self.output_dir / "scraper_state.txt"
+        self.legacy_state_file = self.output_dir / "scraper_state.json"
         self.processed_issues: Set[str] = set()
+        # Keys handed out this run but not yet checkpointed as written
+        self._seen: Set[str] = set()
+        # Projects that failed part way, resumable with --resume
+        self.failed_projects: List[str] = []
+        self._state_fh: Optional[IO[str]] = None
         self.load_state()
 
+        # Raw API responses are streamed here instead of kept on the models,
+        # zstd-compressed when compress_raw is set
+        if compress_raw and zstandard is None:
+            raise ImportError("compress_raw requires the zstandard package")
+        self.compress_raw = compress_raw
+        raw_name = "raw_issues.jsonl.zst" if compress_raw else "raw_issues.jsonl"
+        self.raw_file = self.output_dir / raw_name
+        self._raw_fh: Optional[IO[bytes]] = None
+
         # HTTP client
-        self.client = JiraHttpClient(rate_limit_delay=rate_limit_delay)
+        self.client = JiraHttpClient(
+            rate_limit_delay=rate_limit_delay, max_concurrent=max_concurrent
+        )
 
     def load_state(self) -> None:
         """Load scraper state from disk."""
         if self.state_file.exists():
             try:
                 with open(self.state_file) as f:
-                    state = json.load(f)
-                    self.processed_issues = set(state.get("processed_issues", []))
+                    self.processed_issues = set(f.read().split())
+            except Exception:
+                pass
+        elif self.legacy_state_file.exists():
+            # Checkpoint from before the key-per-line format, rewritten on close
+            try:
+                state = json_utils.loads(self.legacy_state_file.read_bytes())
+                self.processed_issues = set(state.get("processed_issues", []))
             except Exception:
                 pass
 
+    def mark_processed(self, issue_keys: Iterable[str]) -> None:
+        """Mark issues as processed, appending them to the state checkpoint."""
+        new_keys = [key for key in issue_keys if key not in self.processed_issues]
+        if not new_keys:
+            return
+
+        self.processed_issues.update(new_keys)
+        if self._state_fh is None:
+            self._state_fh = open(self.state_file, "a", buffering=1 << 20)
+        self._state_fh.write("\n".join(new_keys) + "\n")
+
+    def flush_state(self) -> None:
+        """Flush buffered checkpoint writes to disk."""
+        if self._state_fh is not None:
+            self._state_fh.flush()
+
+    def checkpoint(self, issue_keys: Iterable[str]) -> None:
+        """Checkpoint issues whose output records have been written."""
+        self.mark_processed(issue_keys)
+        self.flush_state()
+
     def save_state(self) -> None:
-        """Save scraper state to disk."""
-        state = {"processed_issues": list(self.processed_issues)}
-        with open(self.state_file, "w") as f:
-            json.dump(state, f)
+        """Save scraper state to disk, compacting the checkpoint."""
+        if self._state_fh is not None:
+            self._state_fh.close()
+            self._state_fh = None
 
-    async def get_project_issues(self, project: str) -> AsyncGenerator[str, None]:
-        """Get all issue keys for a project."""
-        async for issue in self.client.search_issues(project, fields="key"):
-            yield issue["key"]
+        # Rewrite to a temporary file first so a crash never leaves a torn checkpoint
+        tmp_file = self.state_file.with_suffix(".tmp")
+        with open(tmp_file, "w") as f:
+            f.writelines(f"{key}\n" for key in self.processed_issues)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, self.state_file)
+
+    def save_raw_responses(self, responses: List[Dict[str, Any]]) -> None:
+        """Append raw API responses to the raw JSONL file."""
+        if self._raw_fh is None:
+            self._raw_fh = open(self.raw_file, "ab")
+            if self.compress_raw:
+                # Each session appends its own zstd frame to the file
+                compressor = zstandard.ZstdCompressor(level=3, threads=-1)
+                self._raw_fh = compressor.stream_writer(self._raw_fh)
+        self._raw_fh.write(b"".join(json_utils.dumps(r) + b"\n" for r in responses))
+
+    async def get_project_issues(
+        self, project: str
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Get full details of all issues in a project, straight from the search."""
+        async for page in self.client.search_issue_pages(
+            project, fields="*all", expand="comments", max_results=self.batch_size
+        ):
+            for issue in page:
+                yield issue
 
     async def get_issue_details(self, issue_key: str) -> Optional[JiraIssue]:
         """Get detailed issue information with automatic validation."""
-        if issue_key in self.processed_issues:
+        if not self._is_new(issue_key):
             return None
 
         try:
             data = await self.client.get_issue(issue_key)
+        except Exception as e:
+            logger.warning("Error fetching issue %s: %s", issue_key, e)
+            return None
+
+        issues = await self._process_responses([data])
+        return issues[0] if issues else None
 
-            # Create and validate in one step using Pydantic
-            issue = JiraIssue.from_api_response(data)
-            self.processed_issues.add(issue_key)
-            return issue
+    async def get_issues_details(self, issue_keys: List[str]) -> List[JiraIssue]:
+        """Get details for several issues in a single batched request."""
+        issue_keys = [key for key in issue_keys if self._is_new(key)]
+        if not issue_keys:
+            return []
 
+        try:
+            batch = await self.client.get_issues_batch(
+                issue_keys, batch_size=self.batch_size
+            )
         except Exception as e:
-            print(f"Error fetching/validating issue {issue_key}: {e}")
-            return None
+            logger.warning(
+                "Error fetching issues %s..%s: %s", issue_keys[0], issue_keys[-1], e
+            )
+            return []
 
-    async def scrape_project(self, project: str) -> List[JiraIssue]:
-        """Scrape all issues from a project."""
-        print(f"Scraping project: {project}")
+        return await self._process_responses(batch)
+
+    async def _process_responses(
+        self, responses: List[Dict[str, Any]]
+    ) -> List[JiraIssue]:
+        """Save and parse fetched issues, skipping those already processed."""
+        responses = [r for r in responses if self._is_new(r.get("key"))]
+        if not responses:
+            return []
+        self._seen.update(r["key"] for r in responses if r.get("key"))
+
+        self.save_raw_responses(responses)
+
+        if self.max_concurrent == 1:
+            issues = self._parse_issues(responses)
+        else:
+            # Parse off the event loop so other in-flight responses keep flowing
+            issues = await asyncio.to_thread(self._parse_issues, responses)
+        # Issues are only marked processed through checkpoint() once their
+        # records are written, so a crash never skips unwritten issues
+        return issues
+
+    def _is_new(self, key: Optional[str]) -> bool:
+        """Check an issue was neither processed before nor seen this run."""
+        return key not in self.processed_issues and key not in self._seen
+
+    @staticmethod
+    def _parse_issues(batch: List[Dict[str, Any]]) -> List[JiraIssue]:
+        """Parse a batch of API responses, skipping invalid issues."""
         issues = []
+        for data in batch:
+            try:
+                issues.append(JiraIssue.from_api_response(data))
+            except ValidationError as e:
+                # The structured errors skip pydantic's verbose message formatting
+                errors = e.errors(
+                    include_url=False, include_context=False, include_input=False
+                )
+                logger.warning("Invalid issue %s: %s", data.get("key"), errors)
+            except Exception as e:
+                logger.warning("Error validating issue %s: %s", data.get("key"), e)
 
-        semaphore = asyncio.Semaphore(self.max_concurrent)
+        return issues
+
+    async def iter_project_issues(
+        self, project: str
+    ) -> AsyncGenerator[JiraIssue, None]:
+        """Scrape a project, yielding issues as each search page arrives."""
+        logger.info("Scraping project: %s", project)
+
+        # The search returns full issue details, so each page of up to
+        # batch_size issues costs a single request
+        limit = self.max_issues_per_project
+        page_size = min(self.batch_size, limit) if limit else self.batch_size
+        # Issues processed by an earlier run don't count towards the limit,
+        # so search far enough to get past all of them
+        max_issues = limit + len(self.processed_issues) if limit else None
+        found = 0
 
-        async def fetch_issue(issue_key: str) -> Optional[JiraIssue]:
-            async with semaphore:
-                return await self.get_issue_details(issue_key)
+        async for page in self.client.search_issue_pages(
+            project,
+            fields="*all",
+            expand="comments",
+            max_results=page_size,
+            max_issues=max_issues,
+        ):
+            if limit:
+                page = [r for r in page if self._is_new(r.get("key"))]
+                page = page[: limit - found]
+            found += len(page)
 
-        # Get all issue keys
-        issue_keys = []
-        async for issue_key in self.get_project_issues(project):
-            issue_keys.append(issue_key)
-            if (
-                self.max_issues_per_project
-                and len(issue_keys) >= self.max_issues_per_project
-            ):
+            for issue in await self._process_responses(page):
+                yield issue
+
+            if limit and found >= limit:
                 break
 
-        print(f"Found {len(issue_keys)} issues in {project}")
+    async def scrape_project(self, project: str) -> List[JiraIssue]:
+        """Scrape all issues from a project."""
+        return [issue async for issue in self.iter_project_issues(project)]
 
-        # Fetch issues async
-        tasks = [fetch_issue(key) for key in issue_keys]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def _scrape_project_into(
+        self, project: str, queue: "asyncio.Queue[Optional[JiraIssue]]"
+    ) -> None:
+        """Scrape one project into a queue, reporting failures instead of raising."""
+        count = 0
+        try:
+            async for issue in self.iter_project_issues(project):
+                count += 1
+                await queue.put(issue)
+            logger.info("Scraped %d issues from %s", count, project)
+        except Exception as e:
+            logger.error("Failed to scrape project %s: %s", project, e)
+            self.failed_projects.append(project)
 
-        for result in results:
-            if isinstance(result, JiraIssue):
-                issues.append(result)
-            elif isinstance(result, Exception):
-                print(f"Error processing issue: {result}")
+    async def iter_all_issues(self) -> AsyncGenerator[JiraIssue, None]:
+        """Scrape all configured projects concurrently, yielding issues as they arrive.
 
-        self.save_state()
-        return issues
+        Projects share the client's semaphore and token bucket, so running
+        them side by side does not raise the overall request rate.
+        """
+        queue: "asyncio.Queue[Optional[JiraIssue]]" = asyncio.Queue(_QUEUE_SIZE)
 
-    async def scrape_all_projects(self) -> List[JiraIssue]:
-        """Scrape all configured projects."""
-        all_issues = []
+        async def produce() -> None:
+            await asyncio.gather(
+                *(
+                    self._scrape_project_into(project, queue)
+                    for project in self.projects
+                )
+            )
+            await queue.put(None)
 
-        for project in self.projects:
-            try:
-                issues = await self.scrape_project(project)
-                all_issues.extend(issues)
-                print(f"Scraped {len(issues)} issues from {project}")
-            except Exception as e:
-                print(f"Failed to scrape project {project}: {e}")
+        producer = asyncio.ensure_future(produce())
+        try:
+            while True:
+                issue = await queue.get()
+                if issue is None:
+                    break
+                yield issue
+            await producer
+        finally:
+            producer.cancel()
 
-        return all_issues
+    async def scrape_all_projects(self) -> List[JiraIssue]:
+        """Scrape all configured projects."""
+        return [issue async for issue in self.iter_all_issues()]
 
     async def close(self) -> None:
         """Clean up resources."""
         await self.client.close()
+        if self._raw_fh is not None:
+            self._raw_fh.close()
+            self._raw_fh = None
         self.save_state()
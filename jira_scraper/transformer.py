@@ -1,78 +1,221 @@
 """Data transformation for LLM training."""
 
-import json
+import asyncio
+import logging
+from collections import Counter
+from collections.abc import AsyncIterable as AsyncIterableABC
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Union,
+)
 
 import aiofiles  # type: ignore
+from pydantic import TypeAdapter
 
+from . import json_utils
 from .models import JiraIssue, LLMTrainingRecord
 
+logger = logging.getLogger(__name__)
+
+# Buffered JSONL output is flushed past either of these thresholds
+_FLUSH_BYTES = 1024 * 1024
+_FLUSH_RECORDS = 1000
+
+# Serializes a whole issue list in one pydantic-core call
+_ISSUE_LIST_ADAPTER = TypeAdapter(List[JiraIssue])
+
+IssueStream = Union[Iterable[JiraIssue], AsyncIterable[JiraIssue]]
+OnWritten = Callable[[List[str]], None]
+
+
+async def _iterate(issues: IssueStream) -> AsyncIterator[JiraIssue]:
+    """Iterate over a sync or async stream of issues."""
+    if isinstance(issues, AsyncIterableABC):
+        async for issue in issues:
+            yield issue
+    else:
+        for issue in issues:
+            yield issue
+
+
+class IssueStats:
+    """Running statistics about scraped issues, updated one issue at a time."""
+
+    def __init__(self) -> None:
+        self.total_issues = 0
+        self.projects: Counter[str] = Counter()
+        self.statuses: Counter[str] = Counter()
+        self.priorities: Counter[str] = Counter()
+        self.total_comments = 0
+
+    def add(self, issue: JiraIssue) -> None:
+        """Account for one more issue."""
+        self.total_issues += 1
+
+        if issue.project:
+            self.projects[issue.project] += 1
+        if issue.status:
+            self.statuses[issue.status] += 1
+        if issue.priority:
+            self.priorities[issue.priority] += 1
+
+        self.total_comments += len(issue.comments)
+
+    def update(self, issues: List[JiraIssue]) -> None:
+        """Account for a whole list of issues, counting each field in bulk."""
+        self.total_issues += len(issues)
+        self.projects.update(i.project for i in issues if i.project)
+        self.statuses.update(i.status for i in issues if i.status)
+        self.priorities.update(i.priority for i in issues if i.priority)
+        self.total_comments += sum(len(i.comments) for i in issues)
+
+    def add_record(self, record: Dict[str, Any]) -> None:
+        """Account for an issue already written out as a training record."""
+        metadata = record.get("metadata", {})
+        self.total_issues += 1
+
+        if record.get("project"):
+            self.projects[record["project"]] += 1
+        if metadata.get("status"):
+            self.statuses[metadata["status"]] += 1
+        if metadata.get("priority"):
+            self.priorities[metadata["priority"]] += 1
+
+        self.total_comments += metadata.get("comment_count", 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the statistics, or an empty dict if no issue was seen."""
+        if not self.total_issues:
+            return {}
+
+        return {
+            "total_issues": self.total_issues,
+            "projects": dict(self.projects),
+            "statuses": dict(self.statuses),
+            "priorities": dict(self.priorities),
+            "total_comments": self.total_comments,
+            "avg_comments_per_issue": self.total_comments / self.total_issues,
+        }
+
 
 class DataTransformer:
     """Transform Jira data into LLM training format."""
 
-    def __init__(self, output_dir: Path):
+    def __init__(self, output_dir: Path, compact: bool = False, append: bool = False):
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
-
-    async def transform_issues(self, issues: List[JiraIssue]) -> None:
-        """Transform issues and save as JSONL."""
+        # Compact records keep the issue text only in text_content
+        self.compact = compact
+        # Resumed runs append to the records of the checkpointed issues
+        self.append = append
+
+    async def transform_issues(
+        self, issues: IssueStream, on_written: Optional[OnWritten] = None
+    ) -> None:
+        """Transform issues and save as JSONL, one record as each issue arrives.
+
+        on_written is called with the keys of each batch of records once
+        it has been flushed to the output file.
+        """
         output_file = self.output_dir / "training_data.jsonl"
 
-        async with aiofiles.open(output_file, "w") as f:
-            for issue in issues:
+        buffer: List[bytes] = []
+        buffered_keys: List[str] = []
+        buffered = 0
+
+        async with aiofiles.open(output_file, "ab" if self.append else "wb") as f:
+
+            async def write_buffer() -> None:
+                await f.write(b"".join(buffer))
+                await f.flush()
+                if on_written is not None:
+                    on_written(buffered_keys)
+                buffer.clear()
+                buffered_keys.clear()
+
+            async for issue in _iterate(issues):
                 try:
                     record = LLMTrainingRecord.from_jira_issue(issue)
-                    line = json.dumps(record.model_dump(), ensure_ascii=False)
-                    await f.write(line + "\n")
+                    data = (
+                        record.model_dump()
+                        if self.compact
+                        else record.model_dump_expanded()
+                    )
+                    line = json_utils.dumps(data) + b"\n"
                 except Exception as e:
-                    print(f"Error transforming issue {issue.key}: {e}")
+                    logger.warning("Error transforming issue %s: %s", issue.key, e)
+                    continue
+
+                buffer.append(line)
+                buffered_keys.append(issue.key)
+                buffered += len(line)
+                if buffered >= _FLUSH_BYTES or len(buffer) >= _FLUSH_RECORDS:
+                    await write_buffer()
+                    buffered = 0
+
+            if buffer:
+                await write_buffer()
+
+        logger.info("Saved training data to %s", output_file)
+
+    async def process_all(
+        self, issues: IssueStream, on_written: Optional[OnWritten] = None
+    ) -> Dict[str, Any]:
+        """Save training data and compute statistics in a single pass."""
+        stats = IssueStats()
+        if self.append:
+            # Statistics cover the whole output, including earlier runs
+            await asyncio.to_thread(self._count_written, stats)
+
+        async def counted() -> AsyncIterator[JiraIssue]:
+            async for issue in _iterate(issues):
+                stats.add(issue)
+                yield issue
+
+        await self.transform_issues(counted(), on_written)
+        return stats.to_dict()
+
+    def _count_written(self, stats: IssueStats) -> None:
+        """Account for the records already in the training data file."""
+        output_file = self.output_dir / "training_data.jsonl"
+        if not output_file.exists():
+            return
 
-        print(f"Saved training data to {output_file}")
+        with open(output_file, "rb") as f:
+            for line in f:
+                try:
+                    stats.add_record(json_utils.loads(line))
+                except ValueError:
+                    logger.warning("Skipping unreadable record in %s", output_file)
 
     async def save_raw_data(self, issues: List[JiraIssue]) -> None:
         """Save raw issue data for debugging."""
         output_file = self.output_dir / "raw_issues.json"
 
-        data = [issue.model_dump() for issue in issues]
+        def write() -> None:
+            # raw_data is empty unless the issues were parsed with keep_raw
+            exclude = {
+                i: {"raw_data"} for i, issue in enumerate(issues) if not issue.raw_data
+            }
+            output_file.write_bytes(
+                _ISSUE_LIST_ADAPTER.dump_json(issues, indent=2, exclude=exclude)
+            )
 
-        async with aiofiles.open(output_file, "w") as f:
-            await f.write(json.dumps(data, indent=2, default=str, ensure_ascii=False))
+        # Dumping the whole list blocks, so run it off the event loop entirely
+        await asyncio.to_thread(write)
 
-        print(f"Saved raw data to {output_file}")
+        logger.info("Saved raw data to %s", output_file)
 
     def generate_stats(self, issues: List[JiraIssue]) -> Dict[str, Any]:
         """Generate statistics about the scraped data."""
-        if not issues:
-            return {}
-
-        projects: Dict[str, int] = {}
-        statuses: Dict[str, int] = {}
-        priorities: Dict[str, int] = {}
-        total_comments = 0
-
-        for issue in issues:
-            # Project stats
-            if issue.project:
-                projects[issue.project] = projects.get(issue.project, 0) + 1
-
-            # Status stats
-            if issue.status:
-                statuses[issue.status] = statuses.get(issue.status, 0) + 1
-
-            # Priority stats
-            if issue.priority:
-                priorities[issue.priority] = priorities.get(issue.priority, 0) + 1
-
-            # Comment stats
-            total_comments += len(issue.comments)
-
-        return {
-            "total_issues": len(issues),
-            "projects": projects,
-            "statuses": statuses,
-            "priorities": priorities,
-            "total_comments": total_comments,
-            "avg_comments_per_issue": total_comments / len(issues) if issues else 0,
-        }
+        stats = IssueStats()
+        stats.update(issues)
+        return stats.to_dict()
@@ -0,0 +1,34 @@
+"""Tests for the command line interface."""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from jira_scraper.cli import scrape_data
+from jira_scraper.http_client import JiraHttpClient
+
+from .test_scraper import mock_search_pages
+
+
+@pytest.mark.asyncio
+async def test_scrape_data_resume_keeps_earlier_records(tmp_path):
+    """Test a resumed run appends to the records of the previous run."""
+    pages = mock_search_pages([f"TEST-{i}" for i in range(1, 7)])
+
+    def search_issue_pages(self, project, **kwargs):
+        return pages(project, **kwargs)
+
+    with patch.object(JiraHttpClient, "search_issue_pages", search_issue_pages):
+        await scrape_data(("TEST",), tmp_path, 1, 0, 3)
+        await scrape_data(("TEST",), tmp_path, 1, 0, 3, resume=True)
+
+    keys = [f"TEST-{i}" for i in range(1, 7)]
+    with open(tmp_path / "training_data.jsonl") as f:
+        assert [json.loads(line)["issue_key"] for line in f] == keys
+    assert sorted((tmp_path / "scraper_state.txt").read_text().split()) == keys
+    assert len((tmp_path / "raw_issues.jsonl").read_bytes().splitlines()) == 6
+
+    stats = json.loads((tmp_path / "stats.json").read_text())
+    assert stats["total_issues"] == 6
+    assert stats["projects"] == {"TEST": 6}
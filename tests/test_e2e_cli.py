@@ -40,7 +40,7 @@ def test_cli_e2e_real_api():
 
         # Verify output files exist
         training_file = output_dir / "training_data.jsonl"
-        raw_file = output_dir / "raw_issues.json"
+        raw_file = output_dir / "raw_issues.jsonl"
         stats_file = output_dir / "stats.json"
 
         assert training_file.exists()
@@ -1,10 +1,12 @@
 """Tests for HTTP client."""
 
+import time
 from unittest.mock import AsyncMock, patch
 
+import httpx
 import pytest
 
-from jira_scraper.http_client import JiraHttpClient
+from jira_scraper.http_client import JiraHttpClient, TokenBucket
 
 
 @pytest.fixture
@@ -18,6 +20,36 @@ async def test_http_client_initialization(http_client):
     """Test HTTP client initialization."""
     assert http_client.base_url == "https://issues.apache.org/jira"
     assert http_client.rate_limit_delay == 0.1
+    assert http_client.max_concurrent == 5
+    # Each concurrent slot averages one request per rate_limit_delay
+    assert http_client._tokens.rate == pytest.approx(50)
+    assert http_client.client.headers["Accept"] == "application/json"
+    assert http_client.client.headers["User-Agent"].startswith("jira-scraper/")
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_throttles():
+    """Test token bucket hands out capacity at once, then waits for refill."""
+    bucket = TokenBucket(rate=20, capacity=2)
+
+    start = time.monotonic()
+    await bucket.acquire()
+    await bucket.acquire()
+    assert time.monotonic() - start < 0.04
+
+    await bucket.acquire()
+    assert time.monotonic() - start >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_pause():
+    """Test pausing the bucket delays the next token."""
+    bucket = TokenBucket(rate=100, capacity=5)
+    bucket.pause(0.1)
+
+    start = time.monotonic()
+    await bucket.acquire()
+    assert time.monotonic() - start >= 0.09
 
 
 @pytest.mark.asyncio
@@ -53,6 +85,188 @@ async def test_get_issue(http_client):
         assert issue["key"] == "TEST-123"
 
 
+@pytest.mark.asyncio
+async def test_search_issue_pages(http_client):
+    """Test search yields whole pages."""
+    mock_get = AsyncMock(
+        side_effect=[
+            {"issues": [{"key": "TEST-1"}, {"key": "TEST-2"}]},
+            {"issues": [{"key": "TEST-3"}]},
+        ]
+    )
+
+    with patch.object(http_client, "get", mock_get):
+        pages = [
+            page async for page in http_client.search_issue_pages("TEST", max_results=2)
+        ]
+
+    assert [[i["key"] for i in page] for page in pages] == [
+        ["TEST-1", "TEST-2"],
+        ["TEST-3"],
+    ]
+    assert mock_get.call_args_list[1].args[1]["startAt"] == 2
+
+
+@pytest.mark.asyncio
+async def test_search_issue_pages_concurrent(http_client):
+    """Test remaining pages are fetched from the reported total."""
+
+    async def fake_get(endpoint, params):
+        start = params["startAt"]
+        keys = range(start, min(start + 2, 5))
+        return {"total": 5, "issues": [{"key": f"TEST-{k}"} for k in keys]}
+
+    mock_get = AsyncMock(side_effect=fake_get)
+
+    with patch.object(http_client, "get", mock_get):
+        pages = [
+            page async for page in http_client.search_issue_pages("TEST", max_results=2)
+        ]
+
+    keys = sorted(i["key"] for page in pages for i in page)
+    assert keys == [f"TEST-{k}" for k in range(5)]
+    starts = sorted(c.args[1]["startAt"] for c in mock_get.call_args_list)
+    assert starts == [0, 2, 4]
+
+
+@pytest.mark.asyncio
+async def test_search_issue_pages_max_issues(http_client):
+    """Test no pages are requested past max_issues."""
+    mock_get = AsyncMock(
+        return_value={"total": 100, "issues": [{"key": "TEST-1"}, {"key": "TEST-2"}]}
+    )
+
+    with patch.object(http_client, "get", mock_get):
+        pages = [
+            page
+            async for page in http_client.search_issue_pages(
+                "TEST", max_results=2, max_issues=5
+            )
+        ]
+
+    assert len(pages) == 3
+    assert mock_get.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_search_issue_pages_retries_failed_page(http_client):
+    """Test a failed page is requested again once the other pages are done."""
+    requested = []
+
+    async def fake_get(endpoint, params):
+        start = params["startAt"]
+        requested.append(start)
+        if start == 2 and requested.count(2) == 1:
+            raise httpx.HTTPError("Bad gateway")
+        return {"total": 6, "issues": [{"key": f"TEST-{start}"}] * 2}
+
+    with patch.object(http_client, "get", AsyncMock(side_effect=fake_get)):
+        pages = [
+            page async for page in http_client.search_issue_pages("TEST", max_results=2)
+        ]
+
+    assert [page[0]["key"] for page in pages][-1] == "TEST-2"
+    assert sorted(page[0]["key"] for page in pages) == ["TEST-0", "TEST-2", "TEST-4"]
+    assert requested[-1] == 2
+
+
+@pytest.mark.asyncio
+async def test_search_issue_pages_raises_when_retry_fails(http_client):
+    """Test a page that fails twice ends the search after the other pages."""
+
+    async def fake_get(endpoint, params):
+        start = params["startAt"]
+        if start == 2:
+            raise httpx.HTTPError("Bad gateway")
+        return {"total": 6, "issues": [{"key": f"TEST-{start}"}] * 2}
+
+    pages = []
+    with patch.object(http_client, "get", AsyncMock(side_effect=fake_get)):
+        with pytest.raises(httpx.HTTPError):
+            async for page in http_client.search_issue_pages("TEST", max_results=2):
+                pages.append(page)
+
+    assert sorted(page[0]["key"] for page in pages) == ["TEST-0", "TEST-4"]
+
+
+@pytest.mark.asyncio
+async def test_get_issues_batch(http_client):
+    """Test batched issue fetch uses one JQL search per batch."""
+    mock_get = AsyncMock(
+        side_effect=[
+            {"issues": [{"key": "TEST-1"}, {"key": "TEST-2"}]},
+            {"issues": [{"key": "TEST-3"}]},
+        ]
+    )
+
+    with patch.object(http_client, "get", mock_get):
+        issues = await http_client.get_issues_batch(
+            ["TEST-1", "TEST-2", "TEST-3"], batch_size=2
+        )
+
+    assert [i["key"] for i in issues] == ["TEST-1", "TEST-2", "TEST-3"]
+    assert mock_get.call_count == 2
+    endpoint, params = mock_get.call_args_list[0].args
+    assert endpoint == "/rest/api/2/search"
+    assert params["jql"] == "key in (TEST-1,TEST-2)"
+    assert params["fields"] == "*all"
+
+
+def mock_transport_client(responses):
+    """Create a client whose requests get the given responses in order."""
+    client = JiraHttpClient(rate_limit_delay=0)
+    responses = iter(responses)
+    client.client = httpx.AsyncClient(
+        transport=httpx.MockTransport(lambda request: next(responses))
+    )
+    return client
+
+
+@pytest.mark.asyncio
+async def test_request_retries_server_errors():
+    """Test failed requests are retried with backoff."""
+    client = mock_transport_client(
+        [httpx.Response(503), httpx.Response(200, json={"key": "TEST-1"})]
+    )
+
+    with patch("jira_scraper.http_client.asyncio.sleep", AsyncMock()) as sleep:
+        data = await client.get("/rest/api/2/issue/TEST-1")
+
+    assert data == {"key": "TEST-1"}
+    sleep.assert_awaited_once_with(4.0)
+
+
+@pytest.mark.asyncio
+async def test_request_gives_up_after_max_attempts():
+    """Test the last error is raised once all attempts failed."""
+    client = mock_transport_client([httpx.Response(500)] * 3)
+
+    with patch("jira_scraper.http_client.asyncio.sleep", AsyncMock()) as sleep:
+        with pytest.raises(httpx.HTTPStatusError):
+            await client.get("/rest/api/2/issue/TEST-1")
+
+    assert [c.args[0] for c in sleep.await_args_list] == [4.0, 8.0]
+
+
+@pytest.mark.asyncio
+async def test_request_rate_limited_pauses_all_callers():
+    """Test a 429 pauses the token bucket for the Retry-After delay."""
+    client = mock_transport_client(
+        [
+            httpx.Response(429, headers={"Retry-After": "30"}),
+            httpx.Response(200, json={}),
+        ]
+    )
+
+    with (
+        patch.object(client._tokens, "pause") as pause,
+        patch("jira_scraper.http_client.asyncio.sleep", AsyncMock()),
+    ):
+        await client.get("/rest/api/2/issue/TEST-1")
+
+    pause.assert_called_once_with(30.0)
+
+
 @pytest.mark.asyncio
 async def test_client_cleanup(http_client):
     """Test client cleanup."""
@@ -0,0 +1,23 @@
+"""Tests for JSON helpers."""
+
+from datetime import datetime
+
+from jira_scraper import json_utils
+
+
+def test_dumps_loads_roundtrip():
+    """Test serializing and parsing back."""
+    data = {"key": "TEST-123", "labels": ["bug"], "count": 2}
+
+    raw = json_utils.dumps(data)
+
+    assert isinstance(raw, bytes)
+    assert json_utils.loads(raw) == data
+
+
+def test_dumps_indent_and_datetime():
+    """Test indented output and datetime serialization."""
+    raw = json_utils.dumps({"created": datetime(2023, 1, 1)}, indent=True)
+
+    assert raw.startswith(b"{\n  ")
+    assert json_utils.loads(raw)["created"] == "2023-01-01T00:00:00"
@@ -1,11 +1,20 @@
 """Tests for data models."""
 
+import json
 from datetime import datetime
 
 import pytest
 from pydantic import ValidationError
 
-from jira_scraper.models import JiraComment, JiraIssue, LLMTrainingRecord
+from jira_scraper.models import (
+    JiraComment,
+    JiraIssue,
+    LLMTrainingRecord,
+    _parse_datetime,
+)
+
+# Fixed timestamp shared by the test models
+_NOW = datetime(2023, 1, 1)
 
 
 def test_jira_comment():
@@ -14,7 +23,7 @@ def test_jira_comment():
         id="123",
         author="test_user",
         body="Test comment",
-        created=datetime.now(),
+        created=_NOW,
     )
     assert comment.id == "123"
     assert comment.author == "test_user"
@@ -29,13 +38,35 @@ def test_jira_issue():
         summary="Test issue",
         status="Open",
         reporter="test_user",
-        created=datetime.now(),
-        updated=datetime.now(),
+        created=_NOW,
+        updated=_NOW,
     )
     assert issue.key == "TEST-123"
     assert issue.project == "TEST"
 
 
+def test_jira_issue_reuses_comment_instances():
+    """Test validating an issue keeps the comment objects it was given.
+
+    Guards pydantic's default of never revalidating model instances, which
+    lets issues share their parsed comments instead of copying them.
+    """
+    comment = JiraComment(id="1", author="test_user", body="Test comment", created=_NOW)
+    issue = JiraIssue(
+        key="TEST-123",
+        id="123",
+        project="TEST",
+        summary="Test issue",
+        status="Open",
+        reporter="test_user",
+        created=_NOW,
+        updated=_NOW,
+        comments=[comment],
+    )
+
+    assert issue.comments[0] is comment
+
+
 def test_llm_training_record():
     """Test LLMTrainingRecord creation from JiraIssue."""
     issue = JiraIssue(
@@ -47,14 +78,14 @@ def test_llm_training_record():
         status="Open",
         priority="High",
         reporter="test_user",
-        created=datetime.now(),
-        updated=datetime.now(),
+        created=_NOW,
+        updated=_NOW,
         comments=[
             JiraComment(
                 id="1",
                 author="commenter",
                 body="Test comment",
-                created=datetime.now(),
+                created=_NOW,
             )
         ],
     )
@@ -70,6 +101,12 @@ def test_llm_training_record():
     assert "classification" in record.tasks
     assert "qa" in record.tasks
 
+    expanded = record.model_dump_expanded()
+    assert expanded["tasks"]["summarization"]["input"] == record.text_content
+    assert expanded["tasks"]["classification"]["input"] == record.text_content
+    assert expanded["tasks"]["qa"]["context"] == record.text_content
+    assert "input" not in record.tasks["summarization"]
+
 
 def test_jira_issue_validation_missing_key():
     """Test JiraIssue validation fails for missing key."""
@@ -81,13 +118,11 @@ def test_jira_issue_validation_missing_key():
             summary="Test issue",
             status="Open",
             reporter="test_user",
-            created=datetime.now(),
-            updated=datetime.now(),
+            created=_NOW,
+            updated=_NOW,
         )
-    assert (
-        "1 validation error for JiraIssue\nkey\n  Input should be a valid string"
-        in str(exc_info.value)
-    )
+    errors = exc_info.value.errors(include_url=False)
+    assert [(e["loc"], e["type"]) for e in errors] == [(("key",), "string_type")]
 
 
 def test_jira_issue_validation_missing_project():
@@ -100,13 +135,11 @@ def test_jira_issue_validation_missing_project():
             summary="Test issue",
             status="Open",
             reporter="test_user",
-            created=datetime.now(),
-            updated=datetime.now(),
+            created=_NOW,
+            updated=_NOW,
         )
-    assert (
-        "1 validation error for JiraIssue\nproject\n  Input should be a valid string"
-        in str(exc_info.value)
-    )
+    errors = exc_info.value.errors(include_url=False)
+    assert [(e["loc"], e["type"]) for e in errors] == [(("project",), "string_type")]
 
 
 def test_jira_issue_validation_missing_status():
@@ -119,13 +152,11 @@ def test_jira_issue_validation_missing_status():
             summary="Test issue",
             status=None,
             reporter="test_user",
-            created=datetime.now(),
-            updated=datetime.now(),
+            created=_NOW,
+            updated=_NOW,
         )
-    assert (
-        "1 validation error for JiraIssue\nstatus\n  Input should be a valid string"
-        in str(exc_info.value)
-    )
+    errors = exc_info.value.errors(include_url=False)
+    assert [(e["loc"], e["type"]) for e in errors] == [(("status",), "string_type")]
 
 
 def test_jira_issue_validation_missing_reporter():
@@ -138,13 +169,11 @@ def test_jira_issue_validation_missing_reporter():
             summary="Test issue",
             status="Open",
             reporter=None,
-            created=datetime.now(),
-            updated=datetime.now(),
+            created=_NOW,
+            updated=_NOW,
         )
-    assert (
-        "1 validation error for JiraIssue\nreporter\n  Input should be a valid string"
-        in str(exc_info.value)
-    )
+    errors = exc_info.value.errors(include_url=False)
+    assert [(e["loc"], e["type"]) for e in errors] == [(("reporter",), "string_type")]
 
 
 def test_jira_issue_from_api_response_invalid_data():
@@ -175,3 +204,108 @@ def test_jira_issue_from_api_response_none_data():
     """Test JiraIssue.from_api_response with None data raises ValidationError."""
     with pytest.raises(ValidationError):
         JiraIssue.from_api_response(None)
+
+
+def test_from_api_response_validated_rejects_invalid_data():
+    """Test the validating entry point raises on invalid comments and issues."""
+    with pytest.raises(ValidationError):
+        JiraComment.from_api_response_validated({"id": None, "body": 42})
+
+    with pytest.raises(ValidationError):
+        JiraIssue.from_api_response_validated({})
+
+
+def test_jira_issue_from_api_response_validate_flag():
+    """Test trusted and validated construction build the same issue."""
+    api_response = {
+        "key": "TEST-123",
+        "id": "123",
+        "fields": {
+            "project": {"key": "TEST"},
+            "summary": "Test issue",
+            "status": {"name": "Open"},
+            "reporter": {"displayName": "John Doe"},
+            "created": "2023-01-01T00:00:00.000Z",
+            "updated": "2023-01-02T00:00:00.000Z",
+            "comment": {
+                "comments": [
+                    {
+                        "id": "1",
+                        "body": "Test comment",
+                        "created": "2023-01-01T01:00:00.000Z",
+                    }
+                ]
+            },
+        },
+    }
+
+    trusted = JiraIssue.from_api_response(api_response)
+    validated = JiraIssue.from_api_response_validated(api_response)
+
+    assert trusted == validated
+    assert isinstance(trusted.comments[0], JiraComment)
+    assert trusted.created == datetime.fromisoformat("2023-01-01T00:00:00+00:00")
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2023-01-01T00:00:00.000Z",
+        "2023-01-01T00:00:00.000+00:00",
+        "2023-01-01T00:00:00.000+0000",
+    ],
+)
+def test_parse_datetime(value):
+    """Test Jira timestamps parse to aware datetimes."""
+    parsed = _parse_datetime(value)
+
+    assert parsed == datetime.fromisoformat("2023-01-01T00:00:00+00:00")
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2023-01-01T00:00:00.000Z",
+        "2023-01-01T00:00:00.000+00:00",
+        "2023-01-01T00:00:00.000+0000",
+    ],
+)
+def test_parse_datetime_stdlib_fallback(value, monkeypatch):
+    """Test Jira timestamps parse without ciso8601 installed."""
+    monkeypatch.setattr("jira_scraper.models._parse_iso", None)
+
+    parsed = _parse_datetime(value)
+
+    assert parsed == datetime.fromisoformat("2023-01-01T00:00:00+00:00")
+
+
+@pytest.mark.parametrize("value", [None, "", "not a date"])
+def test_parse_datetime_invalid(value):
+    """Test missing or malformed timestamps parse to None."""
+    assert _parse_datetime(value) is None
+
+
+def test_jira_issue_from_api_response_interns_repeated_strings():
+    """Test repeated values across issues share a single string object."""
+
+    def api_response(key):
+        return json.loads(
+            json.dumps(
+                {
+                    "key": key,
+                    "id": key,
+                    "fields": {
+                        "project": {"key": "TEST"},
+                        "summary": "Test issue",
+                        "status": {"name": "In Progress"},
+                        "reporter": {"displayName": "John Doe"},
+                    },
+                }
+            )
+        )
+
+    first = JiraIssue.from_api_response(api_response("TEST-1"))
+    second = JiraIssue.from_api_response(api_response("TEST-2"))
+
+    assert first.status is second.status
+    assert first.reporter is second.reporter
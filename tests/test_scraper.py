@@ -6,6 +6,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import httpx
 import pytest
+import pytest_asyncio
 
 from jira_scraper.scraper import JiraScraper
 
@@ -16,15 +17,17 @@ def temp_output_dir(tmp_path):
     return tmp_path / "output"
 
 
-@pytest.fixture
-def scraper(temp_output_dir):
-    """Create JiraScraper instance."""
-    return JiraScraper(
+@pytest_asyncio.fixture
+async def scraper(temp_output_dir):
+    """Create JiraScraper instance, closed after the test."""
+    scraper = JiraScraper(
         projects=["TEST"],
         output_dir=temp_output_dir,
         max_concurrent=1,
         rate_limit_delay=0.1,
     )
+    yield scraper
+    await scraper.close()
 
 
 @pytest.mark.asyncio
@@ -48,6 +51,51 @@ async def test_state_management(scraper):
     )
 
     assert "TEST-123" in new_scraper.processed_issues
+    assert not scraper.state_file.with_suffix(".tmp").exists()
+
+
+def test_load_state_reads_legacy_json(temp_output_dir):
+    """Test a checkpoint in the old JSON format is still picked up on resume."""
+    temp_output_dir.mkdir(parents=True)
+    legacy = {"processed_issues": ["TEST-1", "TEST-2"]}
+    (temp_output_dir / "scraper_state.json").write_text(json.dumps(legacy))
+
+    scraper = JiraScraper(projects=["TEST"], output_dir=temp_output_dir)
+
+    assert scraper.processed_issues == {"TEST-1", "TEST-2"}
+
+
+@pytest.mark.asyncio
+async def test_mark_processed_appends_checkpoint(scraper):
+    """Test processed issues are appended to the checkpoint as they complete."""
+    scraper.mark_processed(["TEST-1", "TEST-2"])
+    scraper.mark_processed(["TEST-2", "TEST-3"])
+    scraper.flush_state()
+
+    assert scraper.state_file.read_text().split() == ["TEST-1", "TEST-2", "TEST-3"]
+
+    new_scraper = JiraScraper(projects=["TEST"], output_dir=scraper.output_dir)
+    assert new_scraper.processed_issues == {"TEST-1", "TEST-2", "TEST-3"}
+
+
+@pytest.mark.asyncio
+async def test_save_raw_responses_compressed(temp_output_dir):
+    """Test raw responses can be written as a zstd-compressed stream."""
+    zstandard = pytest.importorskip("zstandard")
+    scraper = JiraScraper(
+        projects=["TEST"], output_dir=temp_output_dir, compress_raw=True
+    )
+
+    scraper.save_raw_responses([{"key": "TEST-1"}, {"key": "TEST-2"}])
+    await scraper.close()
+
+    assert scraper.raw_file.name == "raw_issues.jsonl.zst"
+    with open(scraper.raw_file, "rb") as f:
+        raw = zstandard.ZstdDecompressor().stream_reader(f).read()
+    assert [json.loads(line)["key"] for line in raw.splitlines()] == [
+        "TEST-1",
+        "TEST-2",
+    ]
 
 
 def test_issue_from_api_response():
@@ -92,6 +140,204 @@ def test_issue_from_api_response():
     assert issue.comments[0].body == "Test comment"
 
 
+def make_api_issue(key: str) -> dict:
+    """Build a minimal Jira API issue payload."""
+    return {
+        "key": key,
+        "id": key.split("-")[1],
+        "fields": {
+            "project": {"key": "TEST"},
+            "summary": "Test issue",
+            "status": {"name": "Open"},
+            "reporter": {"displayName": "Jane Doe"},
+        },
+    }
+
+
+def test_parse_issues_logs_structured_validation_errors(caplog):
+    """Test invalid issues are skipped and logged without the full error text."""
+    invalid = make_api_issue("TEST-2")
+    invalid["fields"]["status"] = None
+
+    issues = JiraScraper._parse_issues([make_api_issue("TEST-1"), invalid])
+
+    assert [issue.key for issue in issues] == ["TEST-1"]
+    assert "Invalid issue TEST-2" in caplog.text
+    assert "'loc': ('status',)" in caplog.text
+    assert "errors.pydantic.dev" not in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_get_issues_details_batches_and_skips_processed(scraper):
+    """Test batched detail fetch skips known issues and streams raw responses."""
+    scraper.processed_issues.add("TEST-1")
+
+    with patch.object(
+        scraper.client,
+        "get_issues_batch",
+        AsyncMock(return_value=[make_api_issue("TEST-2")]),
+    ) as mock_batch:
+        issues = await scraper.get_issues_details(["TEST-1", "TEST-2"])
+
+    mock_batch.assert_awaited_once_with(["TEST-2"], batch_size=50)
+    assert [issue.key for issue in issues] == ["TEST-2"]
+    assert issues[0].raw_data == {}
+    # Checkpointed only once its record is written
+    assert "TEST-2" not in scraper.processed_issues
+    assert await scraper.get_issues_details(["TEST-2"]) == []
+
+    # Raw responses are streamed to disk instead of kept on the model
+    await scraper.close()
+    lines = scraper.raw_file.read_text().splitlines()
+    assert [json.loads(line)["key"] for line in lines] == ["TEST-2"]
+
+
+@pytest.mark.asyncio
+async def test_get_issue_details(scraper):
+    """Test single issue fetch skips known issues and reports failures."""
+    scraper.processed_issues.add("TEST-1")
+
+    with patch.object(
+        scraper.client,
+        "get_issue",
+        AsyncMock(side_effect=[make_api_issue("TEST-2"), httpx.HTTPError("boom")]),
+    ) as mock_get_issue:
+        assert await scraper.get_issue_details("TEST-1") is None
+        issue = await scraper.get_issue_details("TEST-2")
+        assert await scraper.get_issue_details("TEST-3") is None
+
+    assert issue is not None and issue.key == "TEST-2"
+    assert mock_get_issue.await_count == 2
+
+
+def mock_search_pages(keys, calls=None):
+    """Create a search_issue_pages replacement serving full issue payloads."""
+
+    async def search_issue_pages(
+        project, fields="key", max_results=50, expand=None, max_issues=None
+    ):
+        if calls is not None:
+            calls.append({"fields": fields, "max_results": max_results})
+        project_keys = [key for key in keys if key.startswith(f"{project}-")]
+        project_keys = project_keys[:max_issues] if max_issues else project_keys
+        for i in range(0, len(project_keys), max_results):
+            yield [make_api_issue(key) for key in project_keys[i : i + max_results]]
+
+    return search_issue_pages
+
+
+@pytest.mark.asyncio
+async def test_scrape_project_uses_full_search_pages(scraper):
+    """Test scrape_project parses search pages without per-issue requests."""
+    scraper.batch_size = 2
+    scraper.processed_issues.add("TEST-2")
+    calls = []
+
+    with (
+        patch.object(
+            scraper.client,
+            "search_issue_pages",
+            mock_search_pages(["TEST-1", "TEST-2", "TEST-3"], calls),
+        ),
+        patch.object(scraper.client, "get_issue", AsyncMock()) as mock_get_issue,
+    ):
+        issues = await scraper.scrape_project("TEST")
+
+    assert [issue.key for issue in issues] == ["TEST-1", "TEST-3"]
+    assert calls == [{"fields": "*all", "max_results": 2}]
+    mock_get_issue.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_iter_all_issues_streams_and_respects_limit(scraper):
+    """Test issues are yielded as they arrive, up to the per-project limit."""
+    scraper.projects = ["TEST", "OTHER"]
+    scraper.max_concurrent = 2
+    scraper.max_issues_per_project = 3
+    keys = [f"{project}-{i}" for project in scraper.projects for i in range(10)]
+
+    with patch.object(scraper.client, "search_issue_pages", mock_search_pages(keys)):
+        keys = [issue.key async for issue in scraper.iter_all_issues()]
+
+    # Projects are scraped concurrently, so only the per-project order is fixed
+    assert [k for k in keys if k.startswith("TEST-")] == ["TEST-0", "TEST-1", "TEST-2"]
+    assert [k for k in keys if k.startswith("OTHER-")] == [
+        "OTHER-0",
+        "OTHER-1",
+        "OTHER-2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_project_issues_limit_skips_processed(scraper):
+    """Test issues processed by an earlier run don't count towards the limit."""
+    scraper.max_issues_per_project = 2
+    scraper.processed_issues = {"TEST-0", "TEST-1"}
+    keys = [f"TEST-{i}" for i in range(5)]
+
+    with patch.object(scraper.client, "search_issue_pages", mock_search_pages(keys)):
+        issues = await scraper.scrape_project("TEST")
+
+    assert [issue.key for issue in issues] == ["TEST-2", "TEST-3"]
+
+
+@pytest.mark.asyncio
+async def test_iter_all_issues_isolates_project_failures(scraper, caplog):
+    """Test a failing project does not stop the others."""
+    scraper.projects = ["BROKEN", "TEST"]
+    search_pages = mock_search_pages(["TEST-1", "TEST-2"])
+
+    async def failing_search_pages(project, **kwargs):
+        if project == "BROKEN":
+            raise httpx.HTTPError("boom")
+        async for page in search_pages(project, **kwargs):
+            yield page
+
+    with patch.object(scraper.client, "search_issue_pages", failing_search_pages):
+        keys = [issue.key async for issue in scraper.iter_all_issues()]
+
+    assert sorted(keys) == ["TEST-1", "TEST-2"]
+    assert scraper.failed_projects == ["BROKEN"]
+    assert "Failed to scrape project BROKEN" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_scrape_project_over_mock_transport(scraper):
+    """Test a scrape through the real HTTP client against a mocked Jira."""
+    keys = [f"TEST-{i}" for i in range(1, 6)]
+    requested = []
+
+    def handler(request):
+        start = int(request.url.params["startAt"])
+        size = int(request.url.params["maxResults"])
+        requested.append(start)
+        issues = [make_api_issue(key) for key in keys[start : start + size]]
+        return httpx.Response(200, json={"total": len(keys), "issues": issues})
+
+    await scraper.client.client.aclose()
+    scraper.client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    scraper.client._tokens.rate = 0
+    scraper.batch_size = 2
+
+    issues = await scraper.scrape_project("TEST")
+    await scraper.close()
+
+    assert sorted(issue.key for issue in issues) == keys
+    assert sorted(requested) == [0, 2, 4]
+    assert len(scraper.raw_file.read_bytes().splitlines()) == len(keys)
+    # Nothing is checkpointed until the records have been written
+    assert scraper.state_file.read_text() == ""
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_flushes_state(scraper):
+    """Test checkpointed issues are on disk without closing the scraper."""
+    scraper.checkpoint(["TEST-1", "TEST-2"])
+
+    assert scraper.processed_issues == {"TEST-1", "TEST-2"}
+    assert scraper.state_file.read_text().split() == ["TEST-1", "TEST-2"]
+
+
 @pytest.mark.asyncio
 async def test_scraper_cleanup(scraper):
     """Test scraper cleanup."""
@@ -9,6 +9,9 @@ import pytest
 from jira_scraper.models import JiraComment, JiraIssue
 from jira_scraper.transformer import DataTransformer
 
+# Fixed timestamp shared by the test models
+_NOW = datetime(2023, 1, 1)
+
 
 @pytest.fixture
 def temp_output_dir(tmp_path):
@@ -22,7 +25,7 @@ def transformer(temp_output_dir):
     return DataTransformer(temp_output_dir)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_issues():
     """Create sample Jira issues."""
     return [
@@ -35,14 +38,14 @@ def sample_issues():
             status="Open",
             priority="High",
             reporter="user1",
-            created=datetime.now(),
-            updated=datetime.now(),
+            created=_NOW,
+            updated=_NOW,
             comments=[
                 JiraComment(
                     id="1",
                     author="commenter1",
                     body="Comment 1",
-                    created=datetime.now(),
+                    created=_NOW,
                 )
             ],
         ),
@@ -55,8 +58,8 @@ def sample_issues():
             status="Closed",
             priority="Low",
             reporter="user2",
-            created=datetime.now(),
-            updated=datetime.now(),
+            created=_NOW,
+            updated=_NOW,
         ),
     ]
 
@@ -79,6 +82,69 @@ async def test_transform_issues(transformer, sample_issues, temp_output_dir):
     assert record["project"] == "TEST"
     assert "Test description 1" in record["text_content"]
     assert "Comment 1" in record["text_content"]
+    assert record["tasks"]["summarization"]["input"] == record["text_content"]
+    assert record["tasks"]["qa"]["context"] == record["text_content"]
+
+
+@pytest.mark.asyncio
+async def test_transform_issues_reports_written_keys(
+    transformer, sample_issues, temp_output_dir
+):
+    """Test on_written only sees keys whose records are already on disk."""
+    output_file = temp_output_dir / "training_data.jsonl"
+    written = []
+
+    def on_written(keys):
+        with output_file.open() as f:
+            on_disk = [json.loads(line)["issue_key"] for line in f]
+        assert on_disk[-len(keys) :] == keys
+        written.extend(keys)
+
+    await transformer.transform_issues(sample_issues, on_written=on_written)
+
+    assert written == [issue.key for issue in sample_issues]
+
+
+@pytest.mark.asyncio
+async def test_transform_issues_compact(sample_issues, temp_output_dir):
+    """Test compact records keep the issue text only in text_content."""
+    transformer = DataTransformer(temp_output_dir, compact=True)
+    await transformer.transform_issues(sample_issues)
+
+    lines = (temp_output_dir / "training_data.jsonl").read_text().splitlines()
+    record = json.loads(lines[0])
+    assert "Test description 1" in record["text_content"]
+    assert "input" not in record["tasks"]["summarization"]
+    assert "context" not in record["tasks"]["qa"]
+
+
+@pytest.mark.asyncio
+async def test_transform_issues_async_stream(
+    transformer, sample_issues, temp_output_dir
+):
+    """Test transforming issues from an async stream."""
+
+    async def stream():
+        for issue in sample_issues:
+            yield issue
+
+    await transformer.transform_issues(stream())
+
+    lines = (temp_output_dir / "training_data.jsonl").read_text().splitlines()
+    assert [json.loads(line)["issue_key"] for line in lines] == [
+        "TEST-123",
+        "TEST-124",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_all(transformer, sample_issues, temp_output_dir):
+    """Test training data and stats are produced in one pass."""
+    stats = await transformer.process_all(sample_issues)
+
+    lines = (temp_output_dir / "training_data.jsonl").read_text().splitlines()
+    assert len(lines) == 2
+    assert stats == transformer.generate_stats(sample_issues)
 
 
 @pytest.mark.asyncio
@@ -93,6 +159,7 @@ async def test_save_raw_data(transformer, sample_issues, temp_output_dir):
     data = json.loads(output_file.read_text())
     assert len(data) == 2
     assert data[0]["key"] == "TEST-123"
+    assert "raw_data" not in data[0]
 
 
 def test_generate_stats(transformer, sample_issues):